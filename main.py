@@ -1,13 +1,39 @@
+import asyncio
+import functools
+import hashlib
 import os
 import re
-from typing import List, Optional, Literal
-
-import requests
-from fastapi import FastAPI, HTTPException
+import time
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Annotated, Any, Dict, List, Literal, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One shared outbound client so connections are pooled across requests;
+    # HTTP/2 multiplexes concurrent lookups to the same host over one kept-alive connection
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+        timeout=httpx.Timeout(20.0),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
 
-app = FastAPI(title="Social Media Downloader API")
+app = FastAPI(title="Social Media Downloader API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,23 +41,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read the ETag and send it back as If-None-Match
+    expose_headers=["ETag"],
 )
 
 
 # -------------------- Models --------------------
+# Request URLs key detect_platform's LRU cache, so keep them bounded
+MAX_URL_LENGTH = 2048
+UrlStr = Annotated[str, Field(max_length=MAX_URL_LENGTH)]
+
+
 class AnalyzeRequest(BaseModel):
-    url: HttpUrl
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    url: UrlStr
 
 
 class DownloadOption(BaseModel):
     type: Literal["mp4", "mp3", "image"]
     quality: Optional[str] = None
-    url: HttpUrl
+    url: str
     note: Optional[str] = None
 
 
+class BatchRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    urls: List[UrlStr]
+
+
 class FetchResponse(BaseModel):
-    platform: Literal["youtube", "instagram"]
+    platform: Optional[Literal["youtube", "instagram"]] = None
     title: Optional[str] = None
     thumbnail: Optional[str] = None
     downloads: List[DownloadOption] = []
@@ -39,122 +80,299 @@ class FetchResponse(BaseModel):
 
 
 # -------------------- Helpers --------------------
-YOUTUBE_REGEX = re.compile(
-    r"^(?:https?:\/\/)?(?:www\.|m\.)?(?:youtube\.com\/(?:watch\?v=|embed\/|shorts\/)|youtu\.be\/)([\w-]{11})"
-)
-INSTAGRAM_REGEX = re.compile(r"^(?:https?:\/\/)?(?:www\.)?instagram\.com\/")
+MAX_BATCH_URLS = 50
 
+OEMBED_URL = "https://www.youtube.com/oembed"
+YTSTREAM_URL = "https://ytstream-download-youtube-videos.p.rapidapi.com/dl"
+YTMP3_URL = "https://youtube-mp36.p.rapidapi.com/dl"
+IG_URL = "https://instagram-downloader-download-instagram-videos-stories.p.rapidapi.com/index"
 
-def detect_platform(url: str) -> Optional[str]:
-    if YOUTUBE_REGEX.search(url):
-        return "youtube"
-    if INSTAGRAM_REGEX.search(url):
-        return "instagram"
-    return None
+# Read once at import; the environment doesn't change while the server runs.
+# Header mappings are read-only since every request shares them.
+RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY") or os.getenv("RAPID_API_KEY")
 
 
-def extract_youtube_id(url: str) -> Optional[str]:
-    m = YOUTUBE_REGEX.search(url)
-    return m.group(1) if m else None
+def _rapidapi_headers(url: str) -> Optional[Mapping[str, str]]:
+    if not RAPIDAPI_KEY:
+        return None
+    return MappingProxyType({"X-RapidAPI-Key": RAPIDAPI_KEY, "X-RapidAPI-Host": urlsplit(url).netloc})
 
 
-# -------------------- Routes --------------------
-@app.get("/")
-def read_root():
-    return {"message": "Social Media Downloader Backend is running"}
+YTSTREAM_HEADERS = _rapidapi_headers(YTSTREAM_URL)
+YTMP3_HEADERS = _rapidapi_headers(YTMP3_URL)
+IG_HEADERS = _rapidapi_headers(IG_URL)
 
+# Instagram media items carry their link under any of these keys, in priority order
+_IG_URL_KEYS = ("url", "link", "video", "image")
 
-@app.post("/api/analyze")
-def analyze(req: AnalyzeRequest):
-    platform = detect_platform(str(req.url))
-    return {"platform": platform, "valid": platform is not None}
+PLATFORM_REGEX = re.compile(
+    r"(?:https?:\/\/)?(?:www\.|m\.)?(?:"
+    r"(?P<yt>(?:youtube\.com\/(?:watch\?v=|embed\/|shorts\/)|youtu\.be\/)([\w-]{11}))"
+    r"|(?P<ig>instagram\.com\/))",
+    # Scheme and host are case-insensitive; the 11-char ID class covers both cases anyway
+    re.IGNORECASE,
+)
 
 
-@app.post("/api/fetch", response_model=FetchResponse)
-def fetch(req: AnalyzeRequest):
-    url = str(req.url)
-    platform = detect_platform(url)
+@functools.lru_cache(maxsize=4096)
+def detect_platform(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return ``(platform, youtube_id)`` for a URL; both are None if unsupported."""
+    m = PLATFORM_REGEX.match(url)
+    if m is None:
+        return None, None
+    if m.group("yt"):
+        return "youtube", m.group(2)
+    return "instagram", None
+
+
+def normalize_instagram_url(url: str) -> str:
+    """Reduce an Instagram URL to ``host/path`` so tracking params don't split the cache."""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+# Upstream responses are effectively static for minutes, so keep the parsed
+# JSON around rather than hitting RapidAPI/oEmbed for every repeat request.
+_yt_meta_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_yt_dl_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_yt_mp3_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_ig_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+# oEmbed ETag/Last-Modified validators outlive the entries above so an expired
+# entry can be revalidated with a conditional request instead of re-downloaded.
+_yt_meta_validators: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+_cache_locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+# Callers holding or queued on each lock; the lock is dropped when the last one leaves
+_cache_lock_users: Dict[Tuple[int, str], int] = {}
+_MISSING = object()
+
+
+# Cap concurrent requests per upstream host so batch fan-out stays under
+# RapidAPI rate limits and the client's connection pool. Semaphores are per
+# worker process: a deployment with N workers allows up to N times these.
+_sem_ytstream = asyncio.Semaphore(20)
+_sem_ytmp3 = asyncio.Semaphore(20)
+_sem_ig = asyncio.Semaphore(20)
+_sem_oembed = asyncio.Semaphore(50)
+
+
+async def _get_json_cached(
+    client: httpx.AsyncClient,
+    cache: TTLCache,
+    key: str,
+    sem: asyncio.Semaphore,
+    url: str,
+    *,
+    validators: Optional[TTLCache] = None,
+    **kwargs: Any,
+) -> Any:
+    """GET ``url`` and return its parsed JSON, memoised in ``cache`` under ``key``.
+
+    Concurrent misses for the same key wait on a shared lock so only one of
+    them goes upstream, and the request itself runs under ``sem``. Non-2xx
+    responses raise ``httpx.HTTPStatusError`` and are not cached. When
+    ``validators`` is given, responses' ETag/Last-Modified are kept there and
+    sent back as ``If-None-Match``/``If-Modified-Since``; a 304 reuses the
+    stored body.
+    """
+    data = cache.get(key, _MISSING)
+    if data is not _MISSING:
+        return data
+
+    lock_key = (id(cache), key)
+    lock = _cache_locks.setdefault(lock_key, asyncio.Lock())
+    _cache_lock_users[lock_key] = _cache_lock_users.get(lock_key, 0) + 1
+    try:
+        async with lock:
+            data = cache.get(key, _MISSING)
+            if data is not _MISSING:
+                return data
+            entry = validators.get(key) if validators is not None else None
+            if entry is not None:
+                headers = dict(kwargs.pop("headers", None) or {})
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["If-Modified-Since"] = entry["last_modified"]
+                kwargs["headers"] = headers
+
+            async with sem:
+                r = await client.get(url, **kwargs)
+            if r.status_code == 304 and entry is not None:
+                data = entry["data"]
+                validators[key] = entry  # re-set to refresh the TTL
+            else:
+                r.raise_for_status()
+                data = orjson.loads(r.content)
+                if validators is not None:
+                    etag = r.headers.get("etag")
+                    last_modified = r.headers.get("last-modified")
+                    if etag or last_modified:
+                        validators[key] = {"etag": etag, "last_modified": last_modified, "data": data}
+            cache[key] = data
+            return data
+    finally:
+        # lock.locked() is already False while a queued waiter has yet to run,
+        # so count users instead; otherwise a newcomer could get a fresh lock
+        # and go upstream alongside that waiter after a failed fetch.
+        users = _cache_lock_users[lock_key] - 1
+        if users:
+            _cache_lock_users[lock_key] = users
+        else:
+            del _cache_lock_users[lock_key]
+            del _cache_locks[lock_key]
+
+
+# Lookups currently in progress, keyed by "platform:id", so identical
+# concurrent requests share one upstream round trip.
+_inflight: Dict[str, "asyncio.Future[FetchResponse]"] = {}
+
+
+async def _fetch_one(client: httpx.AsyncClient, url: str) -> FetchResponse:
+    """Resolve title, thumbnail and download links for a single YouTube/Instagram URL."""
+    platform, vid = detect_platform(url)
     if platform is None:
         raise HTTPException(status_code=400, detail="Unsupported or invalid URL. Only YouTube and Instagram are supported.")
 
-    rapidapi_key = os.getenv("RAPIDAPI_KEY") or os.getenv("RAPID_API_KEY")
+    key = f"{platform}:{vid or normalize_instagram_url(url)}"
+    while (pending := _inflight.get(key)) is not None:
+        try:
+            # shield() so a disconnecting waiter doesn't cancel the shared lookup
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # this waiter itself was cancelled
+            # The leader was cancelled, not us; retry, becoming the leader if nobody else has
+
+    fut: "asyncio.Future[FetchResponse]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await _resolve(client, url, platform, vid)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved when nobody else was waiting
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+def _opt_str(value: Any) -> Optional[str]:
+    """Coerce an upstream scalar to ``str`` so unvalidated models still match their schema."""
+    return None if value is None else str(value)
 
+
+async def _resolve(client: httpx.AsyncClient, url: str, platform: str, vid: Optional[str]) -> FetchResponse:
     if platform == "youtube":
-        vid = extract_youtube_id(url)
-        if not vid:
-            raise HTTPException(status_code=400, detail="Could not parse YouTube video ID.")
+        # oEmbed (no API key required) and the RapidAPI lookups are independent,
+        # so issue them together and pay for the slowest one only.
+        calls = [
+            _get_json_cached(
+                client,
+                _yt_meta_cache,
+                vid,
+                _sem_oembed,
+                OEMBED_URL,
+                # Canonical watch URL: the raw input may lack a scheme or use odd casing
+                params={"url": f"https://www.youtube.com/watch?v={vid}", "format": "json"},
+                timeout=10,
+                validators=_yt_meta_validators,
+            )
+        ]
+        if RAPIDAPI_KEY:
+            calls.append(
+                _get_json_cached(
+                    client,
+                    _yt_dl_cache,
+                    vid,
+                    _sem_ytstream,
+                    YTSTREAM_URL,
+                    params={"id": vid},
+                    headers=YTSTREAM_HEADERS,
+                    timeout=20,
+                )
+            )
+            calls.append(
+                _get_json_cached(
+                    client,
+                    _yt_mp3_cache,
+                    vid,
+                    _sem_ytmp3,
+                    YTMP3_URL,
+                    params={"id": vid},
+                    headers=YTMP3_HEADERS,
+                    timeout=20,
+                )
+            )
+        oembed, *rapid = await asyncio.gather(*calls, return_exceptions=True)
 
         title = None
         thumbnail = None
-        # Try to get metadata using oEmbed (no API key required)
-        try:
-            oembed = requests.get(
-                "https://www.youtube.com/oembed",
-                params={"url": url, "format": "json"},
-                timeout=10,
-            )
-            if oembed.ok:
-                data = oembed.json()
-                title = data.get("title")
-                thumbnail = data.get("thumbnail_url")
-        except Exception:
-            pass
+        if isinstance(oembed, dict):
+            title = _opt_str(oembed.get("title"))
+            thumbnail = _opt_str(oembed.get("thumbnail_url"))
 
         downloads: List[DownloadOption] = []
         info = None
 
         # If RapidAPI key is present, try to fetch downloadable links
-        if rapidapi_key:
-            headers = {
-                "X-RapidAPI-Key": rapidapi_key,
-                "X-RapidAPI-Host": "ytstream-download-youtube-videos.p.rapidapi.com",
-            }
-            try:
-                r = requests.get(
-                    "https://ytstream-download-youtube-videos.p.rapidapi.com/dl",
-                    params={"id": vid},
-                    headers=headers,
-                    timeout=20,
-                )
-                if r.ok:
-                    j = r.json()
+        if RAPIDAPI_KEY:
+            j, j2 = rapid
+            if isinstance(j, httpx.HTTPStatusError):
+                info = f"RapidAPI YouTube fetch failed: {j.response.status_code}"
+            elif isinstance(j, Exception):
+                info = f"RapidAPI YouTube error: {str(j)[:120]}"
+            else:
+                try:
                     # Common shapes: {title, thumbnail, formats: [{quality, url, type}]}
-                    title = title or j.get("title")
-                    thumbnail = thumbnail or j.get("thumbnail")
+                    title = title or _opt_str(j.get("title"))
+                    thumbnail = thumbnail or _opt_str(j.get("thumbnail"))
                     fmts = j.get("formats") or j.get("formats_list") or []
                     for f in fmts:
-                        f_type = f.get("type") or f.get("mimeType", "").split("/")[0]
-                        if "mp4" in str(f.get("url", "")) or "video" in str(f.get("mimeType", "")):
+                        f_url = f.get("url")
+                        mime = f.get("mimeType")
+                        if not isinstance(f_url, str) or not f_url:
+                            continue
+                        if "mp4" in f_url or (isinstance(mime, str) and mime.startswith("video/")):
                             downloads.append(
-                                DownloadOption(type="mp4", quality=f.get("quality") or f.get("qualityLabel"), url=f.get("url"))
+                                DownloadOption.model_construct(
+                                    type="mp4",
+                                    quality=_opt_str(f.get("quality") or f.get("qualityLabel")),
+                                    url=f_url,
+                                    note=None,
+                                )
                             )
-                else:
-                    info = f"RapidAPI YouTube fetch failed: {r.status_code}"
-            except Exception as e:
-                info = f"RapidAPI YouTube error: {str(e)[:120]}"
-
-            # Try MP3 via youtube-mp36
-            try:
-                headers2 = {
-                    "X-RapidAPI-Key": rapidapi_key,
-                    "X-RapidAPI-Host": "youtube-mp36.p.rapidapi.com",
-                }
-                r2 = requests.get(
-                    "https://youtube-mp36.p.rapidapi.com/dl", params={"id": vid}, headers=headers2, timeout=20
-                )
-                if r2.ok:
-                    j2 = r2.json()
+                except Exception as e:
+                    info = f"RapidAPI YouTube error: {str(e)[:120]}"
+
+            # MP3 via youtube-mp36
+            if isinstance(j2, httpx.HTTPStatusError):
+                info = (info + "; " if info else "") + f"MP3 fetch failed: {j2.response.status_code}"
+            elif isinstance(j2, Exception):
+                info = (info + "; " if info else "") + f"MP3 error: {str(j2)[:120]}"
+            else:
+                try:
                     link = j2.get("link") or j2.get("url")
-                    if link:
-                        downloads.append(DownloadOption(type="mp3", quality="128kbps", url=link))
-                else:
-                    info = (info + "; " if info else "") + f"MP3 fetch failed: {r2.status_code}"
-            except Exception as e:
-                info = (info + "; " if info else "") + f"MP3 error: {str(e)[:120]}"
+                    if isinstance(link, str) and link:
+                        downloads.append(DownloadOption.model_construct(type="mp3", quality="128kbps", url=link, note=None))
+                except Exception as e:
+                    info = (info + "; " if info else "") + f"MP3 error: {str(e)[:120]}"
         else:
             info = "RAPIDAPI_KEY not set. Showing metadata only."
 
-        return FetchResponse(platform="youtube", title=title, thumbnail=thumbnail, downloads=downloads, info=info)
+        # Upstream scalars are coerced/type-checked above, so skip re-validation
+        return FetchResponse.model_construct(
+            platform="youtube", title=title, thumbnail=thumbnail, downloads=downloads, info=info
+        )
 
     # Instagram handling
     title = None
@@ -162,48 +380,133 @@ def fetch(req: AnalyzeRequest):
     downloads: List[DownloadOption] = []
     info = None
 
-    if rapidapi_key:
+    if RAPIDAPI_KEY:
         try:
-            headers = {
-                "X-RapidAPI-Key": rapidapi_key,
-                "X-RapidAPI-Host": "instagram-downloader-download-instagram-videos-stories.p.rapidapi.com",
-            }
-            r = requests.get(
-                "https://instagram-downloader-download-instagram-videos-stories.p.rapidapi.com/index",
-                params={"url": url},
-                headers=headers,
+            j = await _get_json_cached(
+                client,
+                _ig_cache,
+                normalize_instagram_url(url),
+                _sem_ig,
+                IG_URL,
+                params={"url": url if "://" in url else f"https://{url}"},
+                headers=IG_HEADERS,
                 timeout=20,
             )
-            if r.ok:
-                j = r.json()
-                # Response can contain media array or single link
-                # Try common fields
-                title = j.get("title") or "Instagram Media"
-                thumb = j.get("thumbnail") or j.get("display_url") or j.get("thumb")
-                if isinstance(thumb, str):
-                    thumbnail = thumb
-                media_list = j.get("media") or j.get("result") or j.get("links") or []
-                if isinstance(media_list, dict):
-                    media_list = [media_list]
-                for m in media_list:
-                    link = m.get("url") or m.get("link") or m.get("video") or m.get("image")
-                    if not link:
-                        continue
-                    mtype = "mp4" if ("video" in str(m.get("type", "")).lower() or str(m.get("is_video", False)).lower() == "true") else "image"
-                    qual = m.get("quality") or m.get("resolution")
-                    downloads.append(DownloadOption(type=mtype, quality=qual, url=link))
-            else:
-                info = f"RapidAPI Instagram fetch failed: {r.status_code}"
+            # Response can contain media array or single link
+            # Try common fields
+            title = _opt_str(j.get("title")) or "Instagram Media"
+            thumb = j.get("thumbnail") or j.get("display_url") or j.get("thumb")
+            if isinstance(thumb, str):
+                thumbnail = thumb
+            media_list = j.get("media") or j.get("result") or j.get("links") or []
+            if isinstance(media_list, dict):
+                media_list = [media_list]
+            for m in media_list:
+                link = next((m[k] for k in _IG_URL_KEYS if m.get(k)), None)
+                if not isinstance(link, str):
+                    continue
+                is_video = m.get("is_video")
+                if "video" in str(m.get("type", "")).lower() or is_video is True or (
+                    isinstance(is_video, str) and is_video.lower() == "true"
+                ):
+                    mtype = "mp4"
+                else:
+                    mtype = "image"
+                qual = _opt_str(m.get("quality") or m.get("resolution"))
+                downloads.append(DownloadOption.model_construct(type=mtype, quality=qual, url=link, note=None))
+        except httpx.HTTPStatusError as e:
+            info = f"RapidAPI Instagram fetch failed: {e.response.status_code}"
         except Exception as e:
             info = f"RapidAPI Instagram error: {str(e)[:120]}"
     else:
         info = "RAPIDAPI_KEY not set. Unable to generate Instagram download links."
 
-    return FetchResponse(platform="instagram", title=title, thumbnail=thumbnail, downloads=downloads, info=info)
+    return FetchResponse.model_construct(
+        platform="instagram", title=title, thumbnail=thumbnail, downloads=downloads, info=info
+    )
+
+
+# Analyze results never change and fetch results are stable for minutes, so
+# the GET variants of those routes let browsers/CDNs reuse them and answer
+# revalidations with 304 (POST responses aren't cacheable).
+CACHE_CONTROL = "public, max-age=300"
+
+
+def _cacheable_json(request: Request, body: bytes, cache_control: str = CACHE_CONTROL) -> Response:
+    """Wrap a serialized JSON body with ``Cache-Control`` and a weak ETag, honouring ``If-None-Match``."""
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# -------------------- Routes --------------------
+@app.get("/")
+def read_root():
+    return {"message": "Social Media Downloader Backend is running"}
+
+
+def _analyze(url: str) -> Dict[str, Any]:
+    platform, _ = detect_platform(url)
+    return {"platform": platform, "valid": platform is not None}
+
+
+@app.post("/api/analyze")
+def analyze(req: AnalyzeRequest):
+    return _analyze(req.url)
+
+
+@app.get("/api/analyze")
+def analyze_cached(request: Request, url: str = Query(..., max_length=MAX_URL_LENGTH)):
+    return _cacheable_json(request, orjson.dumps(_analyze(url.strip())))
+
+
+@app.post("/api/fetch", response_model=FetchResponse)
+async def fetch(req: AnalyzeRequest, request: Request):
+    return await _fetch_one(request.app.state.http, req.url)
+
+
+@app.get("/api/fetch", response_model=FetchResponse)
+async def fetch_cached(request: Request, url: str = Query(..., max_length=MAX_URL_LENGTH)):
+    result = await _fetch_one(request.app.state.http, url.strip())
+    # Don't let edge caches pin an upstream failure for the full max-age
+    cache_control = CACHE_CONTROL if result.info is None else "no-cache"
+    return _cacheable_json(request, result.model_dump_json().encode(), cache_control)
+
+
+@app.post("/api/fetch/batch", response_model=List[FetchResponse])
+async def fetch_batch(req: BatchRequest, request: Request):
+    if len(req.urls) > MAX_BATCH_URLS:
+        raise HTTPException(status_code=413, detail=f"Too many URLs. At most {MAX_BATCH_URLS} are allowed per batch.")
+
+    client: httpx.AsyncClient = request.app.state.http
+    results = await asyncio.gather(*(_fetch_one(client, u) for u in req.urls), return_exceptions=True)
+
+    responses: List[FetchResponse] = []
+    for u, res in zip(req.urls, results):
+        if isinstance(res, BaseException):
+            detail = res.detail if isinstance(res, HTTPException) else str(res)[:120]
+            res = FetchResponse(platform=detect_platform(u)[0], info=detail)
+        responses.append(res)
+    return responses
+
+
+# Health probes hit /test often; reuse the last answer for a few seconds
+# instead of listing collections on every call.
+DB_PROBE_TTL = 5.0
+_db_probe: Optional[Tuple[float, Dict[str, Any]]] = None
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
+    global _db_probe
+    if _db_probe is not None and time.monotonic() - _db_probe[0] < DB_PROBE_TTL:
+        return _db_probe[1]
+
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -214,14 +517,14 @@ def test_database():
     }
 
     try:
-        from database import db  # type: ignore
+        from database import async_db as db  # type: ignore
 
         if db is not None:
             response["database"] = "✅ Available"
             response["database_url"] = "✅ Configured"
             response["database_name"] = db.name if hasattr(db, "name") else "✅ Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await db.list_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -238,6 +541,7 @@ def test_database():
     response["database_url"] = "✅ Set" if _os.getenv("DATABASE_URL") else "❌ Not Set"
     response["database_name"] = "✅ Set" if _os.getenv("DATABASE_NAME") else "❌ Not Set"
 
+    _db_probe = (time.monotonic(), response)
     return response
 
 
@@ -245,4 +549,13 @@ if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Multiple workers need the import string rather than the app object
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        # "auto" picks uvloop/httptools when installed and falls back otherwise (e.g. Windows)
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+    )
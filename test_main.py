@@ -0,0 +1,50 @@
+import pytest
+
+from main import AnalyzeRequest, detect_platform
+
+VID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        # YouTube: schemes, www./m. prefixes, path shapes
+        (f"https://www.youtube.com/watch?v={VID}", ("youtube", VID)),
+        (f"http://youtube.com/watch?v={VID}&t=42", ("youtube", VID)),
+        (f"https://m.youtube.com/watch?v={VID}", ("youtube", VID)),
+        (f"youtube.com/embed/{VID}", ("youtube", VID)),
+        (f"https://www.youtube.com/shorts/{VID}", ("youtube", VID)),
+        (f"https://youtu.be/{VID}", ("youtube", VID)),
+        (f"youtu.be/{VID}", ("youtube", VID)),
+        # Scheme and host are case-insensitive; the ID keeps its case
+        (f"https://www.YouTube.com/watch?v={VID}", ("youtube", VID)),
+        (f"HTTPS://YOUTU.BE/{VID}", ("youtube", VID)),
+        # Instagram
+        ("https://www.instagram.com/p/Cabc123/", ("instagram", None)),
+        ("https://m.instagram.com/reel/xyz", ("instagram", None)),
+        ("instagram.com/p/x", ("instagram", None)),
+        ("https://Instagram.com/p/x", ("instagram", None)),
+        # Unsupported
+        ("https://example.com/watch?v=dQw4w9WgXcQ", (None, None)),
+        ("https://www.youtube.com/watch?v=short", (None, None)),
+        ("https://www.youtube.com/channel/abc", (None, None)),
+        (f"ftp://youtu.be/{VID}", (None, None)),
+        (f"https://notyoutu.be/{VID}", (None, None)),
+        (f"x https://youtu.be/{VID}", (None, None)),
+        # Matching is anchored at the start, so padding must be stripped first
+        (f"  https://youtu.be/{VID}", (None, None)),
+        ("", (None, None)),
+    ],
+)
+def test_detect_platform(url, expected):
+    assert detect_platform(url) == expected
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [f"  https://youtu.be/{VID}", f"https://youtu.be/{VID}\n", f"\t https://youtu.be/{VID} \r\n"],
+)
+def test_analyze_request_strips_whitespace(raw):
+    req = AnalyzeRequest(url=raw)
+    assert req.url == f"https://youtu.be/{VID}"
+    assert detect_platform(req.url) == ("youtube", VID)